@@ -1,5 +1,10 @@
+from collections import OrderedDict
 from copy import deepcopy
+from hashlib import blake2b
+from io import BytesIO
 from math import floor
+from threading import Thread
+from time import monotonic
 
 import numpy as np
 import wx
@@ -33,36 +38,62 @@ class Canvas(wx.Panel):
 
         # wxpython settings
         self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
-        self.background = wx.Bitmap.FromRGBA(1000, 1000, 128, 128, 128)
+        self.background = wx.Brush(wx.Colour(128, 128, 128))
+        self.background_cache = None # The background, spritesheet and rulers
+        self.background_stale = True # The background cache needs repainting
+
+        # Drawing tools reused by every paint
+        self.preview_brush = wx.Brush(wx.Colour(255, 0, 0, 127))
+        self.ruler_pen = wx.Pen(colour=wx.Colour(0, 255, 255, 100), width=2)
+        self.scale_pen = wx.Pen(colour=wx.Colour(0, 0, 0, 255), width=2)
+        self.shade_brush = wx.Brush(wx.Colour(0, 0, 0, 127))
 
         # Internal parameters
         self.left_down = Point()
         self.middle_down = Point()
+        self.motion_pos = None # The last mouse position handled by motion
+        self.refresh_area = None # The area waiting to be repainted
+        self.refresh_interval = 1 / 60 # The shortest time between repaints
+        self.refresh_time = 0 # When the last requested repaint was flushed
+        self.canvas_w, self.canvas_h = self.GetSize()
 
         self.scale_select = None # A `Scale` value
         self.zoom_level = 0
+        self.zoom_pending = False # Waiting to repaint after zooming
         self.scale_factor = 1
         self.scale_rects = ScaleRects()
+        self.scale_key = None # The hitbox the scaling path was built for
+        self.scale_path = None
 
+        self.motion_handlers = {
+            Mode.SELECT: self.__motion_select,
+            Mode.MOVE: self.__motion_move,
+            Mode.DRAW: self.__motion_draw,
+        }
+        self.motion_handler = None # Handles mouse movements in the current mode
         self.mode = None
         self.isolate = False
 
-        self.spritesheet = wx.Bitmap()
+        self.spritesheet = wx.Image() # The decoded spritesheet at full size
         self.spritesheet_bmp = wx.Bitmap()
+        self.spritesheet_bmp_factor = None # The scale factor of the bitmap
+        self.spritesheet_cache = OrderedDict() # Maps file hashes to images
+        self.spritesheet_cache_size = 4 # The most images kept in the cache
         self.spritesheet_loaded = False
+        self.spritesheet_load = 0 # Identifies the latest spritesheet being loaded
+        self.spritesheet_pending = None # The file being loaded and the state before it
         self.spritesheet_pos = Rect()
 
         self.counter = 0
         self.destinations = Rects()
         self.hitbox_labels = {} # Maps a counter to a label
+        self.hitbox_alpha = 127
+        self.hitbox_brush = wx.Brush(wx.Colour(255, 0, 0, self.hitbox_alpha))
         self.hitbox_select = None
-        self.hitboxes = {} # Maps a counter to bitmap
         self.indices = {} # Maps a counter to an index
         self.sprites = {} # Maps tuples (x, y) to a set of counters
 
-        self.preview_bmp = wx.Bitmap() # A red bitmap covering the selection preview
         self.preview_pos = Rect()
-        self.sprite_bg = wx.Bitmap() # A black bitmap covering the entire canvas
         self.sprite_labels = {} # Maps a tuple (x, y) to an label
         self.sprite_pos = Rect()
         self.sprite_select = None # A tuple (x, y)
@@ -71,6 +102,8 @@ class Canvas(wx.Panel):
         self.ruler_ncols = 1
         self.hrulers = np.array([])
         self.vrulers = np.array([])
+        self.ruler_key = None # The canvas state the ruler lines were built for
+        self.ruler_lines = []
 
         self.Bind(wx.EVT_LEFT_DOWN, self.__on_left_down)
         self.Bind(wx.EVT_LEFT_UP, self.__on_left_up)
@@ -78,7 +111,10 @@ class Canvas(wx.Panel):
         self.Bind(wx.EVT_MOUSEWHEEL, self.__on_mousewheel)
         self.Bind(wx.EVT_MOTION, self.__on_motion)
 
+        # The whole canvas is painted over, so never erase it first
+        self.Bind(wx.EVT_ERASE_BACKGROUND, lambda event: None)
         self.Bind(wx.EVT_PAINT, self.__on_paint)
+        self.Bind(wx.EVT_SIZE, self.__on_size)
 
     def load_json(self, data: dict):
         """Loads hitboxes from JSON.
@@ -105,7 +141,7 @@ class Canvas(wx.Panel):
             for hitbox_label, hitbox in hitboxes.items():
                 counters.add(self.counter)
                 self.hitbox_labels[self.counter] = hitbox_label
-                self.indices[self.counter] = self.counter
+                self.indices[self.counter] = self.destinations.size()
                 rect = Rect(
                     x=hitbox.get("x", 0),
                     y=hitbox.get("y", 0),
@@ -113,14 +149,6 @@ class Canvas(wx.Panel):
                     h=hitbox.get("h", 0),
                 )
                 self.destinations.append(rect)
-                self.hitboxes[self.counter] = wx.Bitmap.FromRGBA(
-                    width=rect.w,
-                    height=rect.h,
-                    red=255,
-                    green=0,
-                    blue=0,
-                    alpha=127,
-                )
 
                 self.counter += 1
 
@@ -129,16 +157,48 @@ class Canvas(wx.Panel):
     def load_spritesheet(self, filepath: str):
         """Loads an image as a spritesheet.
 
+        The file is read immediately, but the image is decoded in a background
+        thread so that large images do not block the interface. The
+        spritesheet is shown once it has been decoded.
+
+        The most recently decoded images are cached by the hash of their
+        contents, so reopening the same spritesheet is not decoded again.
+
         Parameters
         ------------
         filepath: str
             the path to the spritesheet file. 
         """
-        self.spritesheet.LoadFile(name=filepath)
-        self.__size_bitmaps()
-        self.set_rulers(rows=1, cols=1)
+        with open(filepath, "rb") as file:
+            data = file.read()
 
-        self.spritesheet_loaded = True
+        key = blake2b(data, digest_size=16).digest()
+
+        # Restored if the spritesheet cannot be decoded
+        self.spritesheet_pending = (
+            filepath,
+            self.spritesheet_loaded,
+            self.ruler_nrows,
+            self.ruler_ncols,
+        )
+
+        self.ruler_nrows = 1
+        self.ruler_ncols = 1
+        self.spritesheet_loaded = False
+        self.spritesheet_load += 1
+
+        image = self.spritesheet_cache.get(key)
+
+        if image is not None:
+            self.__finish_loading_spritesheet(image, self.spritesheet_load, key)
+
+            return
+
+        Thread(
+            target=self.__decode_spritesheet,
+            args=(data, self.spritesheet_load, key),
+            daemon=True,
+        ).start()
 
     def reset(self):
         """Resets the canvas to default parameters."""
@@ -151,8 +211,16 @@ class Canvas(wx.Panel):
         self.mode = None
         self.isolate = False
 
+        self.spritesheet = wx.Image()
+        self.spritesheet_bmp = wx.Bitmap()
+        self.spritesheet_bmp_factor = None
         self.spritesheet_pos = Rect()
         self.spritesheet_loaded = False
+        self.background_stale = True
+
+        # Ignore any spritesheet that is still being decoded
+        self.spritesheet_load += 1
+        self.spritesheet_pending = None
 
         self.hitbox_select = None
         self.counter = 0
@@ -170,6 +238,8 @@ class Canvas(wx.Panel):
         self.ruler_ncols = 1
         self.hrulers = np.array([])
         self.vrulers = np.array([])
+        self.ruler_key = None # The canvas state the ruler lines were built for
+        self.ruler_lines = []
 
     def set_alpha(self, alpha: int):
         """Sets the alpha value for each hitbox.
@@ -180,12 +250,10 @@ class Canvas(wx.Panel):
             the alpha value is between 0 and 255, where 0 is fully transparent
             and 255 is fully opaque.
         """
-        for bitmap in self.hitboxes.values():
-            image = bitmap.ConvertToImage()
-            image.SetAlpha(alpha)
-            bitmap = image.ConvertToBitmap()
+        self.hitbox_alpha = alpha
+        self.hitbox_brush = wx.Brush(wx.Colour(255, 0, 0, alpha))
 
-        self.Refresh()
+        self.Refresh(eraseBackground=False)
 
     def set_rulers(self, rows: int = None, cols: int = None):
         """Sets the number of rulers and the size of the preview.
@@ -203,17 +271,7 @@ class Canvas(wx.Panel):
         if cols is not None:
             self.ruler_ncols = cols
 
-        self.hrulers = np.linspace(
-            start=0, 
-            stop=self.spritesheet_pos.h + 1, 
-            num=self.ruler_nrows + 1
-        )
-        self.vrulers = np.linspace(
-            start=0, 
-            stop=self.spritesheet_pos.w + 1, 
-            num=self.ruler_ncols + 1
-        )
-        self.__size_bitmaps()
+        self.__size_spritesheet()
 
     def to_dict(self):
         """Returns information about the canvas in a JSON compatible format.
@@ -272,7 +330,7 @@ class Canvas(wx.Panel):
 
             for counter in counters:
                 hitbox_label = self.hitbox_labels[counter]
-                hitbox = self.destinations.get(counter)
+                hitbox = self.destinations.get(self.indices[counter])
 
                 hitboxes[hitbox_label] = hitbox.to_dict()
 
@@ -340,7 +398,7 @@ class Canvas(wx.Panel):
 
             for counter in counters:
                 hitbox_label = self.hitbox_labels[counter]
-                hitbox = destinations.get(counter)
+                hitbox = destinations.get(self.indices[counter])
 
                 hitboxes[hitbox_label] = hitbox.to_dict()
 
@@ -356,31 +414,106 @@ class Canvas(wx.Panel):
 
         return data
 
+    @property
+    def mode(self):
+        """The editing mode of the canvas.
+
+        Setting the mode also selects how mouse movements are processed, so
+        the mode is not checked on every mouse movement.
+
+        Returns
+        ---------
+        mode: Mode or None
+            the editing mode of the canvas.
+        """
+        return self.__mode
+
+    @mode.setter
+    def mode(self, mode: Mode):
+        self.__mode = mode
+        self.motion_handler = self.motion_handlers.get(mode)
+
+    def __cache_background(self):
+        """Paints the parts of the canvas that rarely change to a bitmap.
+
+        The background, spritesheet and rulers are only repainted when the
+        canvas is resized, panned or zoomed, or when the spritesheet or rulers
+        change, rather than every time a hitbox is edited. The bitmap is only
+        reallocated when the size of the canvas has changed.
+        """
+        size = wx.Size(max(self.canvas_w, 1), max(self.canvas_h, 1))
+
+        if self.background_cache is None or self.background_cache.GetSize() != size:
+            self.background_cache = wx.Bitmap(size)
+
+        self.background_stale = False
+
+        dc = wx.MemoryDC(self.background_cache)
+        dc.SetBackground(self.background)
+        dc.Clear()
+
+        if self.spritesheet_loaded:
+            gc = wx.GraphicsContext.Create(dc)
+            gc.DrawBitmap(
+                bmp=self.spritesheet_bmp,
+                **self.spritesheet_pos.to_dict(),
+            )
+            del gc
+
+            self.__paint_rulers(dc=dc)
+
+        dc.SelectObject(wx.NullBitmap)
+
     def __create_hitbox(self):
         """Initializes drawing a hitbox."""
-        label = f"hitbox_{self.counter}"
         hitbox = Rect(x=self.left_down.x, y=self.left_down.y, w=0, h=0)
 
         self.destinations.append(hitbox)
         self.indices[self.counter] = self.destinations.size() - 1
-        self.hitbox_labels[self.counter] = label
+        self.hitbox_labels[self.counter] = f"hitbox_{self.counter}"
         self.sprites[self.sprite_select].add(self.counter)
 
         self.hitbox_select = self.counter
         self.counter += 1
 
-        wx.PostEvent(
-            self.Parent,
-            UpdateHitboxEvent(
-                label=label,
-                global_x=int((hitbox.x - self.spritesheet_pos.x) / self.scale_factor),
-                global_y=int((hitbox.y - self.spritesheet_pos.y) / self.scale_factor),
-                local_x=int((hitbox.x - self.sprite_pos.x) / self.scale_factor),
-                local_y=int((hitbox.y - self.sprite_pos.y) / self.scale_factor),
-                width=int(hitbox.w / self.scale_factor),
-                height=int(hitbox.h / self.scale_factor),
-            )
-        )
+        self.__post_hitbox_update(hitbox=hitbox)
+
+    def __decode_spritesheet(self, data: bytes, load: int, key: bytes):
+        """Decodes a spritesheet image outside of the main thread.
+
+        Parameters
+        ------------
+        data: bytes
+            the contents of the spritesheet file.
+        load: int
+            identifies which call to :meth:`load_spritesheet` this is.
+        key: bytes
+            the hash of the contents of the spritesheet file.
+        """
+        image = wx.Image(BytesIO(data))
+
+        wx.CallAfter(self.__finish_loading_spritesheet, image, load, key)
+
+    def __delete_hitbox(self, counter: int):
+        """Deletes a hitbox from the selected sprite.
+
+        The hitboxes stored after the deleted hitbox shift down by one, so
+        their indices are updated to match.
+
+        Parameters
+        ------------
+        counter: int
+            the counter of the hitbox.
+        """
+        index = self.indices.pop(counter)
+        self.destinations.delete(index=index)
+
+        for key, value in self.indices.items():
+            if value > index:
+                self.indices[key] = value - 1
+
+        del self.hitbox_labels[counter]
+        self.sprites[self.sprite_select].remove(counter)
 
     def __draw_hitbox(self, point: Point):
         """Draws a hitbox.
@@ -390,8 +523,22 @@ class Canvas(wx.Panel):
         point: Point
             the location of the mouse.
         """
-        dx = abs(point.x - self.left_down.x)
-        dy = abs(point.y - self.left_down.y)
+        # Draw from the corner nearest to the origin so the size is positive
+        if point.x < self.left_down.x:
+            x = point.x
+            dx = self.left_down.x - point.x
+
+        else:
+            x = self.left_down.x
+            dx = point.x - self.left_down.x
+
+        if point.y < self.left_down.y:
+            y = point.y
+            dy = self.left_down.y - point.y
+
+        else:
+            y = self.left_down.y
+            dy = point.y - self.left_down.y
 
         dx_scale = floor(dx / self.scale_factor)
         dy_scale = floor(dy / self.scale_factor)
@@ -399,37 +546,116 @@ class Canvas(wx.Panel):
         if dx_scale <= 0 or dy_scale <= 0:
             return
 
-        hitbox = Rect(
-            x=min(self.left_down.x, point.x),
-            y=min(self.left_down.y, point.y),
-            w=dx,
-            h=dy,
-        )
+        index = self.indices[self.hitbox_select]
+        before = self.destinations.get(index=index)
+        hitbox = Rect(x=x, y=y, w=dx, h=dy)
 
-        self.destinations.set(index=self.hitbox_select, rect=hitbox)
-        self.hitboxes[self.hitbox_select] = wx.Bitmap.FromRGBA(
-            width=dx,
-            height=dy,
-            red=255,
-            green=0,
-            blue=0,
-            alpha=127,
-        )
+        # The hitbox is already drawn to the mouse
+        if hitbox.to_dict() == before.to_dict():
+            return
 
-        wx.PostEvent(
-            self.Parent,
-            UpdateHitboxEvent(
-                label=self.hitbox_labels[self.hitbox_select],
-                global_x=int((hitbox.x - self.spritesheet_pos.x) / self.scale_factor),
-                global_y=int((hitbox.y - self.spritesheet_pos.y) / self.scale_factor),
-                local_x=int((hitbox.x - self.sprite_pos.x) / self.scale_factor),
-                local_y=int((hitbox.y - self.sprite_pos.y) / self.scale_factor),
-                width=int(hitbox.w / self.scale_factor),
-                height=int(hitbox.h / self.scale_factor),
-            )
-        )
+        self.destinations.set(index=index, rect=hitbox)
+
+        self.__post_hitbox_update(hitbox=hitbox)
+
+        self.__refresh_hitbox(before=before, after=hitbox)
+
+    def __finish_loading_spritesheet(self, image: wx.Image, load: int, key: bytes):
+        """Shows a spritesheet once it has been decoded.
 
-        self.Refresh()
+        Parameters
+        ------------
+        image: wx.Image
+            the decoded spritesheet.
+        load: int
+            identifies which call to :meth:`load_spritesheet` this is. The
+            image is ignored if another spritesheet has been loaded since.
+        key: bytes
+            the hash of the contents of the spritesheet file.
+        """
+        if not self:
+            return
+
+        if not image.IsOk():
+            if load == self.spritesheet_load:
+                self.__restore_spritesheet()
+
+            return
+
+        # Keep the most recently used images in the cache
+        self.spritesheet_cache[key] = image
+        self.spritesheet_cache.move_to_end(key)
+
+        if len(self.spritesheet_cache) > self.spritesheet_cache_size:
+            self.spritesheet_cache.popitem(last=False)
+
+        if load != self.spritesheet_load:
+            return
+
+        self.spritesheet_pending = None
+        self.spritesheet = image
+        self.spritesheet_bmp_factor = None
+        self.__size_bitmaps()
+        self.set_rulers()
+
+        self.spritesheet_loaded = True
+
+        self.Refresh(eraseBackground=False)
+
+    def __flush_refresh(self):
+        """Repaints the area of the canvas requested since the last repaint."""
+        # The canvas may have been destroyed while waiting
+        if not self:
+            return
+
+        self.RefreshRect(self.refresh_area, eraseBackground=False)
+        self.refresh_area = None
+        self.refresh_time = monotonic()
+
+    def __motion_draw(self, event: wx.MouseEvent, point: Point):
+        """Processes mouse movements in draw mode.
+
+        Parameters
+        ------------
+        event: wx.MouseEvent
+            the event containing information about mouse button presses and
+            releases and mouse movements.
+        point: Point
+            the location of the mouse.
+        """
+        if event.LeftIsDown() and self.hitbox_select is not None:
+            self.__draw_hitbox(point=point)
+
+    def __motion_move(self, event: wx.MouseEvent, point: Point):
+        """Processes mouse movements in move mode.
+
+        Parameters
+        ------------
+        event: wx.MouseEvent
+            the event containing information about mouse button presses and
+            releases and mouse movements.
+        point: Point
+            the location of the mouse.
+        """
+        if event.LeftIsDown() and self.hitbox_select is not None:
+            if self.scale_select is not None:
+                self.__scale_hitbox(point=point)
+
+            else:
+                self.__translate_hitbox(point=point)
+
+    def __motion_select(self, event: wx.MouseEvent, point: Point):
+        """Processes mouse movements in select mode.
+
+        Parameters
+        ------------
+        event: wx.MouseEvent
+            the event containing information about mouse button presses and
+            releases and mouse movements.
+        point: Point
+            the location of the mouse.
+        """
+        self.__set_preview_zone(point=point)
 
     def __on_left_down(self, event: wx.MouseEvent):
         """Processes left mouse button presses.
@@ -468,15 +694,14 @@ class Canvas(wx.Panel):
         if self.mode == Mode.MOVE:
             self.scale_select = None
 
-        elif self.mode == Mode.DRAW:
-            w = int(self.destinations.w[self.hitbox_select])
-            h = int(self.destinations.h[self.hitbox_select])
+        # No hitbox is drawn if there was no sprite selected to draw on
+        elif self.mode == Mode.DRAW and self.hitbox_select is not None:
+            index = self.indices[self.hitbox_select]
+            w = int(self.destinations.w[index])
+            h = int(self.destinations.h[index])
 
             if w == 0 or h == 0:
-                self.destinations.delete(index=self.hitbox_select)
-                del self.indices[self.hitbox_select]
-                del self.hitbox_labels[self.hitbox_select]
-                self.sprites[self.sprite_select].remove(self.hitbox_select)
+                self.__delete_hitbox(counter=self.hitbox_select)
 
             self.hitbox_select = None
 
@@ -501,27 +726,19 @@ class Canvas(wx.Panel):
             the event containing information about mouse button presses and
             releases and mouse movements.
         """
+        position = tuple(event.GetPosition())
 
-        if self.mode == Mode.SELECT:
-            point = Point(*event.GetPosition())
-            self.__set_preview_zone(point=point)
-
-        if event.LeftIsDown():
-            if self.mode == Mode.MOVE and self.hitbox_select is not None:
-                point = Point(*event.GetPosition())
-
-                if self.scale_select is not None:
-                    self.__scale_hitbox(point=point)
+        # Some platforms send motion events without the mouse moving
+        if position == self.motion_pos:
+            return
 
-                else:
-                    self.__translate_hitbox(point=point)
+        self.motion_pos = position
+        point = Point(*position)
 
-            elif self.mode == Mode.DRAW and self.hitbox_select is not None:
-                point = Point(*event.GetPosition())
-                self.__draw_hitbox(point=point)
+        if self.motion_handler is not None:
+            self.motion_handler(event=event, point=point)
 
-        elif event.MiddleIsDown():
-            point = Point(*event.GetPosition())
+        if event.MiddleIsDown() and not event.LeftIsDown():
             self.__pan(point=point)
 
     def __on_mousewheel(self, event: wx.MouseEvent):
@@ -552,11 +769,12 @@ class Canvas(wx.Panel):
 
         old_factor = self.scale_factor
 
-        if self.zoom_level == 0:
-            self.scale_factor = 1
-        
+        # Zooming in keeps an integer scale factor
+        if self.zoom_level >= 0:
+            self.scale_factor = self.zoom_level + 1
+
         else:
-            self.scale_factor  = (abs(self.zoom_level) + 1) ** (self.zoom_level / abs(self.zoom_level))
+            self.scale_factor = 1 / (1 - self.zoom_level)
 
         factor = self.scale_factor / old_factor
 
@@ -579,10 +797,14 @@ class Canvas(wx.Panel):
         if self.hitbox_select is not None:
             self.scale_rects.set(rect=self.destinations.get(self.indices[self.hitbox_select]))
 
-        self.__size_bitmaps()
-        self.set_rulers()
+        # Keep the spritesheet size in step with the positions straight away,
+        # so nothing is painted or hit tested against the old size
+        self.__size_spritesheet()
 
-        self.Refresh()
+        # Rescale and repaint at most once per frame while the wheel spins
+        if not self.zoom_pending:
+            self.zoom_pending = True
+            wx.CallLater(16, self.__refresh_zoom)
 
     def __on_paint(self, event: wx.PaintEvent):
         """Repaints the canvas.
@@ -594,52 +816,103 @@ class Canvas(wx.Panel):
             repainted.
         """
         dc = wx.AutoBufferedPaintDC(self)
-        gc = wx.GraphicsContext.Create(dc)
 
-        # Paint background
-        w, h = self.GetSize()
-        gc.DrawBitmap(bmp=self.background, x=0, y=0, w=w, h=h)
+        # Only the area that needs to be repainted is drawn
+        area = self.GetUpdateRegion().GetBox()
 
-        # Paint spritesheet
-        if self.spritesheet_loaded:
-            gc.DrawBitmap(
-                bmp=self.spritesheet_bmp, 
-                **self.spritesheet_pos.to_dict(),
-            )
+        if area.IsEmpty():
+            area = wx.Rect(0, 0, self.canvas_w, self.canvas_h)
 
-            self.__paint_rulers(dc=dc)
+        dc.SetClippingRegion(area)
+
+        # Paint background, spritesheet and rulers
+        if self.background_stale:
+            self.__cache_background()
+
+        dc.DrawBitmap(self.background_cache, 0, 0)
+
+        paint_selection = self.mode == Mode.SELECT or self.sprite_select is not None
+        paint_hitboxes = len(self.destinations) > 0
+        paint_scale = self.mode == Mode.MOVE and self.hitbox_select is not None
+
+        # Only create a graphics context when there is something translucent
+        # to paint over the background
+        if not (paint_selection or paint_hitboxes or paint_scale):
+            return
+
+        gc = wx.GraphicsContext.Create(dc)
+        gc.Clip(area.x, area.y, area.width, area.height)
 
         # Paint selection preview
-        if self.mode == Mode.SELECT or self.sprite_select is not None:
+        if paint_selection:
             self.__paint_selection_zone(gc=gc)
 
-        self.__paint_hitboxes(gc=gc)
+        if paint_hitboxes:
+            self.__paint_hitboxes(gc=gc, area=area)
 
-        if self.mode == Mode.MOVE and self.hitbox_select is not None:
+        if paint_scale:
             self.__paint_scale_rects(gc=gc)
 
-    def __paint_hitboxes(self, gc: wx.GraphicsContext):
+    def __on_size(self, event: wx.SizeEvent):
+        """Keeps track of the size of the canvas.
+
+        Parameters
+        ------------
+        event: wx.SizeEvent
+            a size event is sent when the canvas is resized.
+        """
+        self.canvas_w, self.canvas_h = event.GetSize()
+        self.background_stale = True
+
+        event.Skip()
+
+    def __paint_hitboxes(self, gc: wx.GraphicsContext, area: wx.Rect):
         """Paints the hitboxes to the canvas.
 
+        Each hitbox is filled with the same translucent brush, so overlapping
+        hitboxes are darker the more of them are stacked. Empty hitboxes and
+        hitboxes outside of the repainted area are skipped.
+
         Parameters
         ------------
         gc: wx.GraphicsContext
             the object drawn upon.
+        area: wx.Rect
+            the area of the canvas being repainted.
         """ 
+        indices = []
+
         for sprite, counters in self.sprites.items():
             if self.isolate and sprite != self.sprite_select:
                 continue
 
-            for index in counters:
-                hitbox = self.destinations.get(index)
+            indices.extend(self.indices[counter] for counter in counters)
 
-                if hitbox.w <= 0 or hitbox.h <= 0:
-                    continue
+        if not indices:
+            return
 
-                gc.DrawBitmap(
-                    bmp=self.hitboxes[index],
-                    **hitbox.to_dict(),
-                )
+        x, y, w, h = self.destinations.rects[:, indices].astype(int)
+
+        # Only keep the hitboxes that can be seen
+        visible = (
+            (w > 0)
+            & (h > 0)
+            & (x + w >= area.x)
+            & (x <= area.x + area.width)
+            & (y + h >= area.y)
+            & (y <= area.y + area.height)
+        )
+
+        if not visible.any():
+            return
+
+        hitboxes = np.stack((x, y, w, h))[:, visible].T.tolist()
+
+        gc.SetPen(wx.TRANSPARENT_PEN)
+        gc.SetBrush(self.hitbox_brush)
+
+        for x, y, w, h in hitboxes:
+            gc.DrawRectangle(x=x, y=y, w=w, h=h)
 
     def __paint_rulers(self, dc: wx.DC):
         """Paints rulers on the canvas.
@@ -650,24 +923,40 @@ class Canvas(wx.Panel):
             the device context where graphics are drawn.
         """
         # Set colour to cyan
-        dc.SetPen(wx.Pen(colour=wx.Colour(0, 255, 255, 100), width=2))
+        dc.SetPen(self.ruler_pen)
+
+        canvas_w = self.canvas_w
+        canvas_h = self.canvas_h
+
+        key = (
+            canvas_w,
+            canvas_h,
+            self.ruler_nrows,
+            self.ruler_ncols,
+            self.spritesheet_pos.x,
+            self.spritesheet_pos.y,
+            self.spritesheet_pos.w,
+            self.spritesheet_pos.h,
+        )
 
-        canvas_w, canvas_h = self.GetSize()
+        # Only rebuild the lines when the rulers have changed
+        if key != self.ruler_key:
+            hrulers = self.hrulers + self.spritesheet_pos.y
+            rows = np.zeros(shape=(self.ruler_nrows + 1, 4), dtype=int)
+            rows[:, 1] = hrulers
+            rows[:, 2] = canvas_w
+            rows[:, 3] = hrulers
 
-        hrulers = self.hrulers + self.spritesheet_pos.y
-        rows = np.zeros(shape=(self.ruler_nrows + 1, 4), dtype=int)
-        rows[:, 1] = hrulers
-        rows[:, 2] = canvas_w
-        rows[:, 3] = hrulers
+            vrulers = self.vrulers + self.spritesheet_pos.x
+            cols = np.zeros(shape=(self.ruler_ncols + 1, 4), dtype=int)
+            cols[:, 0] = vrulers
+            cols[:, 2] = vrulers
+            cols[:, 3] = canvas_h
 
-        vrulers = self.vrulers + self.spritesheet_pos.x
-        cols = np.zeros(shape=(self.ruler_ncols + 1, 4), dtype=int)
-        cols[:, 0] = vrulers
-        cols[:, 2] = vrulers
-        cols[:, 3] = canvas_h
+            self.ruler_key = key
+            self.ruler_lines = np.concatenate((rows, cols)).tolist()
 
-        dc.DrawLineList(rows.tolist())
-        dc.DrawLineList(cols.tolist())
+        dc.DrawLineList(self.ruler_lines)
 
     def __paint_scale_rects(self, gc: wx.GraphicsContext):
         """Paints the scale rectangles on the selected hitbox.
@@ -682,86 +971,68 @@ class Canvas(wx.Panel):
         gc: wx.GraphicsContext
             the object drawn upon.
         """
-        gc.SetPen(wx.Pen(colour=wx.Colour(0, 0, 0, 255), width=2))
+        gc.SetPen(self.scale_pen)
 
         hitbox = self.destinations.get(self.indices[self.hitbox_select])
-        centre = hitbox.centre
-
-        # Draw a circle in the centre of the hitbox
-        gc.DrawEllipse(
-            x=centre.x,
-            y=centre.y,
-            w=20,
-            h=20,
-        )
+        key = (hitbox.x, hitbox.y, hitbox.w, hitbox.h)
+
+        # Only rebuild the path when the hitbox has changed
+        if key != self.scale_key:
+            path = gc.CreatePath()
 
-        # Draw squares on each corner and midpoint
-        for index in self.scale_rects.keys.values():
-            gc.DrawRectangle(**self.scale_rects.rects.get(index).to_dict())
+            # Add a circle in the centre of the hitbox
+            centre = hitbox.centre
+            path.AddEllipse(x=centre.x - 10, y=centre.y - 10, w=20, h=20)
+
+            # Add squares on each corner and midpoint
+            for index in self.scale_rects.keys.values():
+                path.AddRectangle(**self.scale_rects.rects.get(index).to_dict())
+
+            self.scale_key = key
+            self.scale_path = path
+
+        gc.StrokePath(self.scale_path)
 
     def __paint_selection_zone(self, gc: wx.GraphicsContext):
         """Paints the selection zone.
 
+        The canvas outside of the selection zone is darkened with a single fill
+        that is clipped around the selection zone.
+
         Parameters
         ------------
         gc: wx.GraphicsContext
             the object drawn upon.
         """
-        w = self.sprite_bg.GetWidth()
-        h = self.sprite_bg.GetHeight()
+        w = self.canvas_w
+        h = self.canvas_h
 
-        if self.sprite_select is None:
-            # Darken the entire canvas
-            gc.DrawBitmap(bmp=self.sprite_bg, x=0, y=0, w=w, h=h)
+        gc.SetPen(wx.TRANSPARENT_PEN)
 
-        else:
-            # Darken everywhere except the selection zone
+        # Darken everywhere except the selection zone
+        region = wx.Region(0, 0, w, h)
 
-            # Top left
-            gc.DrawBitmap(
-                bmp=self.sprite_bg,
-                x=self.sprite_pos.x + self.sprite_pos.w - w,
-                y=self.sprite_pos.y - h,
-                w=w,
-                h=h,
-            )
-
-            # Top right
-            gc.DrawBitmap(
-                bmp=self.sprite_bg,
-                x=self.sprite_pos.x + self.sprite_pos.w,
-                y=self.sprite_pos.y + self.sprite_pos.h - h,
-                w=w,
-                h=h,
+        if self.sprite_select is not None:
+            region.Subtract(
+                wx.Rect(
+                    self.sprite_pos.x,
+                    self.sprite_pos.y,
+                    self.sprite_pos.w,
+                    self.sprite_pos.h,
+                )
             )
 
-            # Bottom right
-            gc.DrawBitmap(
-                bmp=self.sprite_bg,
-                x=self.sprite_pos.x,
-                y=self.sprite_pos.y + self.sprite_pos.h,
-                w=w,
-                h=h,
-            )
-
-            # Bottom left
-            gc.DrawBitmap(
-                bmp=self.sprite_bg,
-                x=self.sprite_pos.x - w,
-                y=self.sprite_pos.y,
-                w=w,
-                h=h,
-            )
+        # Keep the clip to the repainted area once the selection zone is done
+        gc.PushState()
+        gc.Clip(region)
+        gc.SetBrush(self.shade_brush)
+        gc.DrawRectangle(x=0, y=0, w=w, h=h)
+        gc.PopState()
 
         if self.preview_pos.x > 0 and self.preview_pos.y > 0:
             # Redden selection zone preview
-            gc.DrawBitmap(
-                bmp=self.preview_bmp,
-                x=self.preview_pos.x,
-                y=self.preview_pos.y,
-                w=self.preview_pos.w,
-                h=self.preview_pos.h,
-            )
+            gc.SetBrush(self.preview_brush)
+            gc.DrawRectangle(**self.preview_pos.to_dict())
 
     def __pan(self, point: Point):
         """Moves all drawn objects.
@@ -785,19 +1056,120 @@ class Canvas(wx.Panel):
             self.scale_rects.move(dx=dx, dy=dy)
 
         self.middle_down.set(**point.to_dict())
+        self.background_stale = True
 
-        self.Refresh()
+        self.__request_refresh()
 
-    def __scale(self, bitmap: wx.Bitmap):
-        """Scales a bitmap to the current scale factor."""
-        return (
-            bitmap.ConvertToImage()
-                .Scale(
-                    width=int(bitmap.GetWidth() * self.scale_factor),
-                    height=int(bitmap.GetHeight() * self.scale_factor),
-                )
-                .ConvertToBitmap()
+    def __post_hitbox_update(self, hitbox: Rect):
+        """Sends the position and size of the selected hitbox to the parent.
+
+        Parameters
+        ------------
+        hitbox: Rect
+            the selected hitbox on the canvas.
+        """
+        scale_factor = self.scale_factor
+        x = hitbox.x
+        y = hitbox.y
+
+        wx.PostEvent(
+            self.Parent,
+            UpdateHitboxEvent(
+                label=self.hitbox_labels[self.hitbox_select],
+                global_x=int((x - self.spritesheet_pos.x) / scale_factor),
+                global_y=int((y - self.spritesheet_pos.y) / scale_factor),
+                local_x=int((x - self.sprite_pos.x) / scale_factor),
+                local_y=int((y - self.sprite_pos.y) / scale_factor),
+                width=int(hitbox.w / scale_factor),
+                height=int(hitbox.h / scale_factor),
+            )
+        )
+
+    def __refresh_hitbox(self, before: Rect, after: Rect):
+        """Repaints only the area of the canvas affected by a changed hitbox.
+
+        The area is padded to include the scaling pins around the hitbox.
+
+        Parameters
+        ------------
+        before: Rect
+            the hitbox before it was changed.
+        after: Rect
+            the hitbox after it was changed.
+        """
+        dirty = wx.Rect(before.x, before.y, before.w, before.h).Union(
+            wx.Rect(after.x, after.y, after.w, after.h)
         )
+        dirty.Inflate(22, 22)
+
+        self.__request_refresh(rect=dirty)
+
+    def __refresh_zoom(self):
+        """Rescales the spritesheet and repaints the canvas after zooming."""
+        # The canvas may have been destroyed while waiting
+        if not self:
+            return
+
+        self.zoom_pending = False
+
+        self.__size_bitmaps()
+
+        self.Refresh(eraseBackground=False)
+
+    def __request_refresh(self, rect: wx.Rect = None):
+        """Schedules an area of the canvas to be repainted.
+
+        Mouse events can arrive much faster than the canvas can be painted, so
+        every area requested before the event loop is idle again is combined
+        and repainted once. Repaints are also limited to 60 per second; an
+        area requested sooner than that is repainted once the interval has
+        passed, so the last change is never lost.
+
+        Parameters
+        ------------
+        rect: wx.Rect
+            the area to repaint. The entire canvas is repainted if this is
+            `None`.
+        """
+        if rect is None:
+            rect = wx.Rect(0, 0, self.canvas_w, self.canvas_h)
+
+        if self.refresh_area is None:
+            self.refresh_area = wx.Rect(rect)
+            wait = self.refresh_time + self.refresh_interval - monotonic()
+
+            if wait <= 0:
+                wx.CallAfter(self.__flush_refresh)
+
+            else:
+                wx.CallLater(max(int(wait * 1000), 1), self.__flush_refresh)
+
+        else:
+            self.refresh_area = self.refresh_area.Union(rect)
+
+    def __restore_spritesheet(self):
+        """Restores the canvas after a spritesheet could not be decoded and
+        tells the user."""
+        filepath, loaded, rows, cols = self.spritesheet_pending
+        self.spritesheet_pending = None
+
+        self.spritesheet_loaded = loaded
+        self.set_rulers(rows=rows, cols=cols)
+
+        self.Refresh(eraseBackground=False)
+
+        wx.LogError(f"Could not load the spritesheet {filepath}")
+
+    def __scale(self, image: wx.Image):
+        """Scales an image to the current scale factor as a bitmap.
+
+        The image is scaled directly, rather than converting a bitmap back to
+        an image every time the zoom level changes.
+        """
+        return image.Scale(
+            width=int(image.GetWidth() * self.scale_factor),
+            height=int(image.GetHeight() * self.scale_factor),
+        ).ConvertToBitmap()
 
     def __set_preview_zone(self, point: Point):
         """Find the preview zone given the mouse coordinates.
@@ -807,60 +1179,90 @@ class Canvas(wx.Panel):
         point: Point
             the location of the mouse.
         """
-        vrulers = self.vrulers + self.spritesheet_pos.x
-        hrulers = self.hrulers + self.spritesheet_pos.y
-
         # Find which rectangle in the grid contains (x, y)
-        x_in = np.logical_and(vrulers[:-1] <= point.x, point.x < vrulers[1:])
-        y_in = np.logical_and(hrulers[:-1] <= point.y, point.y < hrulers[1:])
+        col = (
+            (point.x - self.spritesheet_pos.x)
+            * self.ruler_ncols
+            // (self.spritesheet_pos.w + 1)
+        )
+        row = (
+            (point.y - self.spritesheet_pos.y)
+            * self.ruler_nrows
+            // (self.spritesheet_pos.h + 1)
+        )
 
-        # Define the rectangle parameters
-        rect_x = np.sum(x_in * vrulers[:-1])
-        rect_y = np.sum(y_in * hrulers[:-1])
-        rect_w = np.sum(x_in * vrulers[1:]) - rect_x
-        rect_h = np.sum(y_in * hrulers[1:]) - rect_y
+        if 0 <= col < self.ruler_ncols and 0 <= row < self.ruler_nrows:
+            # Define the rectangle parameters
+            rect_x = self.vrulers[col] + self.spritesheet_pos.x
+            rect_y = self.hrulers[row] + self.spritesheet_pos.y
+            rect_w = self.vrulers[col + 1] - self.vrulers[col]
+            rect_h = self.hrulers[row + 1] - self.hrulers[row]
 
+        else:
+            # The mouse is outside of the spritesheet
+            rect_x = rect_y = rect_w = rect_h = 0
+
+        before = self.preview_pos.to_dict()
         self.preview_pos.set(x=rect_x, y=rect_y, w=rect_w, h=rect_h)
 
-        self.Refresh()
+        if self.preview_pos.to_dict() != before:
+            self.__request_refresh()
 
     def __set_scaling_rects(self):
-        """Find a hitbox in the mouse position."""
+        """Find a hitbox in the mouse position.
+
+        Hitboxes are already grouped by the sprite they belong to, so only the
+        hitboxes of the selected sprite are tested. If hitboxes overlap, the
+        most recently drawn one is found.
+        """
+        # Counters only increase, so the most recently drawn hitbox is last
+        counters = sorted(self.sprites[self.sprite_select])
+        indices = [self.indices[counter] for counter in counters]
+
+        x = self.destinations.x[indices]
+        y = self.destinations.y[indices]
+
         x_in = np.logical_and(
-            self.destinations.x <= self.left_down.x,
-            self.left_down.x <= self.destinations.x + self.destinations.w,
+            x <= self.left_down.x,
+            self.left_down.x <= x + self.destinations.w[indices],
         )
         y_in = np.logical_and(
-            self.destinations.y <= self.left_down.y,
-            self.left_down.y <= self.destinations.y + self.destinations.h,
+            y <= self.left_down.y,
+            self.left_down.y <= y + self.destinations.h[indices],
         )
-        left_down_in = np.logical_and(x_in, y_in)
-
-        for counter in self.sprites[self.sprite_select]:
-            if left_down_in[self.indices[counter]]:
-                self.hitbox_select = counter
-                hitbox = self.destinations.get(self.hitbox_select)
-                self.scale_rects.set(rect=hitbox)
-
-                wx.PostEvent(
-                    self.Parent,
-                    UpdateHitboxEvent(
-                        label=self.hitbox_labels[self.hitbox_select],
-                        global_x=int((hitbox.x - self.spritesheet_pos.x) / self.scale_factor),
-                        global_y=int((hitbox.y - self.spritesheet_pos.y) / self.scale_factor),
-                        local_x=int((hitbox.x - self.sprite_pos.x) / self.scale_factor),
-                        local_y=int((hitbox.y - self.sprite_pos.y) / self.scale_factor),
-                        width=int(hitbox.w / self.scale_factor),
-                        height=int(hitbox.h / self.scale_factor),
-                    )
-                )
+        hits = np.flatnonzero(np.logical_and(x_in, y_in))
 
-                self.Refresh()
+        if hits.size == 0:
+            return
 
-                break
+        hit = hits[-1]
+
+        # The hitbox is already selected
+        if counters[hit] == self.hitbox_select:
+            return
+
+        hitbox = self.destinations.get(indices[hit])
+
+        if self.hitbox_select is None:
+            before = hitbox
+
+        else:
+            before = self.destinations.get(self.indices[self.hitbox_select])
+
+        self.hitbox_select = counters[hit]
+        self.scale_rects.set(rect=hitbox)
+
+        self.__post_hitbox_update(hitbox=hitbox)
+
+        self.__refresh_hitbox(before=before, after=hitbox)
 
     def __set_selection_zone(self):
-        """Sets the selection zone from the preview zone."""
+        """Sets the selection zone from the preview zone.
+
+        The canvas is only repainted if the selection zone has changed.
+        """
+        before = (self.sprite_select, self.sprite_pos.to_dict())
+
         # Select the rectangle currently hovered over
         self.sprite_pos.set(**self.preview_pos.to_dict())
 
@@ -868,6 +1270,9 @@ class Canvas(wx.Panel):
         if self.sprite_pos.w <= 0 or self.sprite_pos.h <= 0:
             self.sprite_select = None
 
+            if before[0] is not None:
+                self.__request_refresh()
+
             return
 
         # Selection is indices of spritesheet
@@ -882,9 +1287,12 @@ class Canvas(wx.Panel):
         if self.sprites.get(self.sprite_select) is None:
             self.sprites[self.sprite_select] = set()
 
+        if (self.sprite_select, self.sprite_pos.to_dict()) == before:
+            return
+
         wx.PostEvent(self.Parent, SpriteSelectedEvent(label=self.sprite_labels[self.sprite_select]))
 
-        self.Refresh()
+        self.__request_refresh()
 
     def __scale_hitbox(self, point: Point):
         """Scales a hitbox.
@@ -906,62 +1314,74 @@ class Canvas(wx.Panel):
         if dy_scale == 0:
             dy = 0
 
+        # The mouse has not moved far enough to scale the hitbox
+        if dx == 0 and dy == 0:
+            return
+
         index = self.indices[self.hitbox_select]
-        hitbox = self.destinations.get(index=index)
+        before = self.destinations.get(index=index)
+        hitbox = Rect(x=before.x, y=before.y, w=before.w, h=before.h)
         hitbox.scale(scale=self.scale_select, dx=dx, dy=dy)
         self.destinations.set(index=index, rect=hitbox)
 
         self.left_down.move(dx=dx, dy=dy)
         self.scale_rects.set(hitbox)
 
-        wx.PostEvent(
-            self.Parent,
-            UpdateHitboxEvent(
-                label=self.hitbox_labels[self.hitbox_select],
-                global_x=int((hitbox.x - self.spritesheet_pos.x) / self.scale_factor),
-                global_y=int((hitbox.y - self.spritesheet_pos.y) / self.scale_factor),
-                local_x=int((hitbox.x - self.sprite_pos.x) / self.scale_factor),
-                local_y=int((hitbox.y - self.sprite_pos.y) / self.scale_factor),
-                width=int(hitbox.w / self.scale_factor),
-                height=int(hitbox.h / self.scale_factor),
-            )
-        )
+        self.__post_hitbox_update(hitbox=hitbox)
 
-        self.Refresh()
+        self.__refresh_hitbox(before=before, after=hitbox)
 
     def __size_bitmaps(self):
-        """Resizes the bitmaps based on the zoom level."""
-        self.spritesheet_bmp = self.__scale(self.spritesheet)
+        """Rescales the spritesheet bitmap based on the zoom level.
 
-        spritesheet_w = self.spritesheet_bmp.GetWidth()
-        spritesheet_h = self.spritesheet_bmp.GetHeight()
+        The spritesheet is only rescaled when the scale factor has changed
+        since it was last scaled.
+        """
+        # The spritesheet may still be decoding
+        if not self.spritesheet.IsOk():
+            return
+
+        if self.spritesheet_bmp_factor != self.scale_factor:
+            self.spritesheet_bmp = self.__scale(self.spritesheet)
+            self.spritesheet_bmp_factor = self.scale_factor
 
-        self.spritesheet_pos.set(w=spritesheet_w, h=spritesheet_h)
+        self.background_stale = True
+
+    def __size_spritesheet(self):
+        """Resizes the spritesheet, selection zone and rulers based on the zoom
+        level and the number of rows and columns.
+
+        The sizes are taken from the decoded spritesheet, so they can be
+        updated before the spritesheet bitmap is rescaled.
+        """
+        # The spritesheet may still be decoding
+        if self.spritesheet.IsOk():
+            self.spritesheet_pos.set(
+                w=int(self.spritesheet.GetWidth() * self.scale_factor),
+                h=int(self.spritesheet.GetHeight() * self.scale_factor),
+            )
+
+        spritesheet_w = self.spritesheet_pos.w
+        spritesheet_h = self.spritesheet_pos.h
 
         select_w = int(spritesheet_w // self.ruler_ncols)
         select_h = int(spritesheet_h // self.ruler_nrows)
 
-        self.preview_bmp = wx.Bitmap.FromRGBA(
-            width=select_w,
-            height=select_h,
-            red=255,
-            green=0,
-            blue=0,
-            alpha=127,
-        )
         self.sprite_pos.set(w=select_w, h=select_h)
 
-        canvas_w, canvas_h = self.GetSize()
-
-        self.sprite_bg = wx.Bitmap.FromRGBA(
-            width=canvas_w,
-            height=canvas_h,
-            red=0,
-            green=0,
-            blue=0,
-            alpha=127,
+        self.hrulers = np.linspace(
+            start=0, 
+            stop=spritesheet_h + 1, 
+            num=self.ruler_nrows + 1
+        )
+        self.vrulers = np.linspace(
+            start=0, 
+            stop=spritesheet_w + 1, 
+            num=self.ruler_ncols + 1
         )
 
+        self.background_stale = True
+
     def __translate_hitbox(self, point: Point):
         """Translates a hitbox.
         
@@ -976,35 +1396,28 @@ class Canvas(wx.Panel):
         dx_scale = floor(dx / self.scale_factor)
         dy_scale = floor(dy / self.scale_factor)
 
-        index = self.indices[self.hitbox_select]
-
         if dx_scale == 0:
             dx = 0
 
         if dy_scale == 0:
             dy = 0
 
+        # The mouse has not moved far enough to move the hitbox
+        if dx == 0 and dy == 0:
+            return
+
+        index = self.indices[self.hitbox_select]
+        before = self.destinations.get(index=index)
         self.destinations.move_rect(
             index=index,
             dx=dx,
             dy=dy,
         )
-        self.left_down.move(dx=dx, dy=dy)
-        self.scale_rects.set(rect=self.destinations.get(index))
-
         hitbox = self.destinations.get(index=index)
 
-        wx.PostEvent(
-            self.Parent,
-            UpdateHitboxEvent(
-                label=self.hitbox_labels[self.hitbox_select],
-                global_x=int((hitbox.x - self.spritesheet_pos.x) / self.scale_factor),
-                global_y=int((hitbox.y - self.spritesheet_pos.y) / self.scale_factor),
-                local_x=int((hitbox.x - self.sprite_pos.x) / self.scale_factor),
-                local_y=int((hitbox.y - self.sprite_pos.y) / self.scale_factor),
-                width=int(hitbox.w / self.scale_factor),
-                height=int(hitbox.h / self.scale_factor),
-            )
-        )
+        self.left_down.move(dx=dx, dy=dy)
+        self.scale_rects.set(rect=hitbox)
+
+        self.__post_hitbox_update(hitbox=hitbox)
 
-        self.Refresh()
+        self.__refresh_hitbox(before=before, after=hitbox)
@@ -17,13 +17,36 @@ ALL_EXPAND = wx.ALL | wx.EXPAND
 CENTER_RIGHT = wx.ALL | wx.ALIGN_RIGHT | wx.ALIGN_CENTER_VERTICAL
 
 
+CTRL_SIZE = wx.Size(180, -1)
+
+
+# The hitbox properties shown in the inspector, as (name, label) pairs
+HITBOX_FIELDS = (
+    ("label", "Label"),
+    ("global_x", "Global x"),
+    ("global_y", "Global y"),
+    ("local_x", "Local x"),
+    ("local_y", "Local y"),
+    ("width", "Width"),
+    ("height", "Height"),
+)
+
+
 SpriteSelectedEvent, EVT_SPRITE_SELECTED = NewEvent()
 ToggleIsolateEvent, EVT_TOGGLE_ISOLATE = NewEvent()
 UpdateHitboxEvent, EVT_UPDATE_HITBOX = NewEvent()
 UpdateTransparencyEvent, EVT_UPDATE_TRANSPARENCY = NewEvent()
 
 
-class Mode(enum.Enum):
+class Group(enum.IntFlag):
+    """These define the groups of properties in the :class:`Inspector`."""
+
+    SPRITESHEET = enum.auto()
+    SPRITE = enum.auto()
+    HITBOX = enum.auto()
+
+
+class Mode(enum.IntEnum):
     """These define the mode of the :class:`Canvas`."""
 
     SELECT = enum.auto()
@@ -31,7 +54,7 @@ class Mode(enum.Enum):
     DRAW = enum.auto()
 
 
-class Scale(enum.Enum):
+class Scale(enum.IntEnum):
     """These define the possible scaling transformations that can be applied."""
 
     TOP = enum.auto()
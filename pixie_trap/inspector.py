@@ -3,6 +3,9 @@ import wx
 from pixie_trap.constants import (
     ALL_EXPAND, 
     CENTER_RIGHT, 
+    CTRL_SIZE,
+    HITBOX_FIELDS,
+    Group,
     ToggleIsolateEvent,
     UpdateTransparencyEvent,
 )
@@ -23,14 +26,26 @@ class Inspector(wx.Panel):
         # wxpython settings
         self.SetMaxSize(wx.Size(300, -1))
 
+        # Lay out the inspector once all of the properties are placed
+        self.Freeze()
+
+        self.header_font = wx.Font(wx.FontInfo().Bold()) # Shared by the group headers
+
         self.__init_spritesheet_properties()
         self.__init_sprite_properties()
         self.__init_hitbox_properties()
 
+        self.enabled_groups = Group.SPRITESHEET | Group.SPRITE | Group.HITBOX
+
         self.__size_components()
 
+        # The hitbox properties are shown disabled until a hitbox can be edited
+        self.__enable_groups(groups=Group.SPRITESHEET | Group.SPRITE)
+
+        self.Thaw()
+
         self.Bind(wx.EVT_CHECKBOX, self.__on_checkbox, id=self.isolate_hitboxes.GetId())
-        self.Bind(wx.EVT_SLIDER, self.__on_slider, id=self.transparency.GetId())
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.__on_destroy, id=self.GetId())
 
     def disable_hitbox_properties(self):
         """Disables the ability to edit the hitbox properties.
@@ -48,35 +63,7 @@ class Inspector(wx.Panel):
 
         """
 
-        self.hitbox_line_label.Disable()
-        self.hitbox_line_widget.Disable()
-
-        self.hitbox_header.Disable()
-        self.hitbox_header_blank.Disable()
-
-        self.hitbox_label_label.Disable()
-        self.hitbox_label.Disable()
-
-        self.hitbox_global_x_label.Disable()
-        self.hitbox_global_x.Disable()
-
-        self.hitbox_global_y_label.Disable()
-        self.hitbox_global_y.Disable()
-
-        self.hitbox_local_x_label.Disable()
-        self.hitbox_local_x.Disable()
-
-        self.hitbox_local_y_label.Disable()
-        self.hitbox_local_y.Disable()
-
-        self.hitbox_width_label.Disable()
-        self.hitbox_width.Disable()
-
-        self.hitbox_height_label.Disable()
-        self.hitbox_height.Disable()
-
-        self.transparency_label.Disable()
-        self.transparency.Disable()
+        self.__enable_groups(groups=self.enabled_groups & ~Group.HITBOX)
 
     def disable_sprite_properties(self):
         """Disables the ability to edit sprite properties.
@@ -88,17 +75,7 @@ class Inspector(wx.Panel):
 
         """
 
-        self.sprite_line_label.Disable()
-        self.sprite_line_widget.Disable()
-
-        self.sprite_header.Disable()
-        self.sprite_header_blank.Disable()
-
-        self.sprite_label_label.Disable()
-        self.sprite_label.Disable()
-
-        self.isolate_hitboxes_label.Disable()
-        self.isolate_hitboxes.Disable()
+        self.__enable_groups(groups=self.enabled_groups & ~Group.SPRITE)
 
     def disable_spritesheet_properties(self):
         """Disables the ability to edit spritesheet properties.
@@ -110,17 +87,7 @@ class Inspector(wx.Panel):
 
         """
 
-        self.spritesheet_line_label.Disable()
-        self.spritesheet_line_widget.Disable()
-
-        self.spritesheet_header.Disable()
-        self.spritesheet_header_blank.Disable()
-
-        self.spritesheet_rows_label.Disable()
-        self.spritesheet_rows.Disable()
-
-        self.spritesheet_cols_label.Disable()
-        self.spritesheet_cols.Disable()
+        self.__enable_groups(groups=self.enabled_groups & ~Group.SPRITESHEET)
 
     def enable_hitbox_properties(self):
         """Enables the ability to edit the hitbox properties.
@@ -138,35 +105,7 @@ class Inspector(wx.Panel):
 
         """
 
-        self.hitbox_line_label.Enable()
-        self.hitbox_line_widget.Enable()
-
-        self.hitbox_header.Enable()
-        self.hitbox_header_blank.Enable()
-
-        self.hitbox_label_label.Enable()
-        self.hitbox_label.Enable()
-
-        self.hitbox_global_x_label.Enable()
-        self.hitbox_global_x.Enable()
-
-        self.hitbox_global_y_label.Enable()
-        self.hitbox_global_y.Enable()
-
-        self.hitbox_local_x_label.Enable()
-        self.hitbox_local_x.Enable()
-
-        self.hitbox_local_y_label.Enable()
-        self.hitbox_local_y.Enable()
-
-        self.hitbox_width_label.Enable()
-        self.hitbox_width.Enable()
-
-        self.hitbox_height_label.Enable()
-        self.hitbox_height.Enable()
-
-        self.transparency_label.Enable()
-        self.transparency.Enable()
+        self.__enable_groups(groups=self.enabled_groups | Group.HITBOX)
 
     def enable_sprite_properties(self):
         """Enables the ability to edit sprite properties.
@@ -178,17 +117,7 @@ class Inspector(wx.Panel):
 
         """
 
-        self.sprite_line_label.Enable()
-        self.sprite_line_widget.Enable()
-
-        self.sprite_header.Enable()
-        self.sprite_header_blank.Enable()
-
-        self.sprite_label_label.Enable()
-        self.sprite_label.Enable()
-
-        self.isolate_hitboxes_label.Enable()
-        self.isolate_hitboxes.Enable()
+        self.__enable_groups(groups=self.enabled_groups | Group.SPRITE)
 
     def enable_spritesheet_properties(self):
         """Enables the ability to edit spritesheet properties.
@@ -200,26 +129,109 @@ class Inspector(wx.Panel):
 
         """
 
-        self.spritesheet_line_label.Enable()
-        self.spritesheet_line_widget.Enable()
-
-        self.spritesheet_header.Enable()
-        self.spritesheet_header_blank.Enable()
-
-        self.spritesheet_rows_label.Enable()
-        self.spritesheet_rows.Enable()
-
-        self.spritesheet_cols_label.Enable()
-        self.spritesheet_cols.Enable()
+        self.__enable_groups(groups=self.enabled_groups | Group.SPRITESHEET)
 
     def reset(self):
         """Resets the inspector to default parameters."""
-        self.spritesheet_rows.SetValue("1")
-        self.spritesheet_cols.SetValue("1")
+        self.spritesheet_rows.SetValue(1)
+        self.spritesheet_cols.SetValue(1)
 
         self.isolate_hitboxes.Enable()
+
         self.transparency.SetValue(127)
 
+    def set_hitbox_properties(self, **values):
+        """Shows the properties of the selected hitbox.
+
+        A control is only updated when the value it shows is different.
+
+        Parameters
+        ------------
+        values:
+            the hitbox properties, keyed by the names in `HITBOX_FIELDS`.
+        """
+        for name, ctrl in self.hitbox_ctrls.items():
+            if name in values and ctrl.GetValue() != values[name]:
+                ctrl.SetValue(values[name])
+
+    def __align_labels(self):
+        """Gives the labels the same width in every group of properties, so
+        that the columns line up.
+        """
+        labels = [
+            self.spritesheet_header,
+            self.spritesheet_rows_label,
+            self.spritesheet_cols_label,
+            self.sprite_header,
+            self.sprite_label_label,
+            self.isolate_hitboxes_label,
+            self.hitbox_header,
+            *self.hitbox_field_labels,
+            self.transparency_label,
+        ]
+        headers = [self.spritesheet_header, self.sprite_header, self.hitbox_header]
+
+        label_w = max(label.GetBestSize().GetWidth() for label in labels)
+
+        for header in headers:
+            header.SetMinSize(wx.Size(label_w, -1))
+
+    def __create_group_sizer(
+        self,
+        line: wx.StaticLine,
+        header: wx.StaticText,
+        items: list,
+    ):
+        """Lays out a group of properties in two columns.
+
+        Parameters
+        ------------
+        line: wx.StaticLine
+            the separator at the top of the group, spanning both columns.
+        header: wx.StaticText
+            the name of the group below the separator, in the first column.
+        items: list
+            the rest of the group as `(window, flag)` pairs, placed left to
+            right and then top to bottom.
+
+        Returns
+        ---------
+        sizer: wx.GridBagSizer
+            the sizer containing the group.
+        """
+        sizer = wx.GridBagSizer(vgap=10, hgap=5)
+        sizer.Add(line, (0, 0), (1, 2), ALL_EXPAND)
+        sizer.Add(header, (1, 0), (1, 1), ALL_EXPAND)
+
+        for index, (window, flag) in enumerate(items, start=4):
+            sizer.Add(window, (index // 2, index % 2), (1, 1), flag)
+
+        return sizer
+
+    def __enable_groups(self, groups: Group):
+        """Enables the given groups of properties and disables the rest.
+
+        Only the groups that change state are enabled or disabled.
+
+        Parameters
+        ------------
+        groups: Group
+            the groups of properties to enable.
+        """
+        changed = groups ^ self.enabled_groups
+
+        panels = (
+            (Group.SPRITESHEET, self.spritesheet_panel),
+            (Group.SPRITE, self.sprite_panel),
+            (Group.HITBOX, self.hitbox_panel),
+        )
+
+        for group, panel in panels:
+            if changed & group:
+                panel.Enable(bool(groups & group))
+
+        self.enabled_groups = groups
+
     def __init_hitbox_properties(self):
         """Initializes the hitbox properties.
 
@@ -236,44 +248,54 @@ class Inspector(wx.Panel):
 
         """
 
-        self.hitbox_line_label = wx.StaticLine(parent=self)
-        self.hitbox_line_widget = wx.StaticLine(parent=self)
-
-        self.hitbox_header = wx.StaticText(parent=self, label="Hitbox")
-        self.hitbox_header.SetFont(wx.Font(wx.FontInfo().Bold()))
-        self.hitbox_header_blank = wx.StaticText(parent=self, label="")
+        self.hitbox_panel = wx.Panel(parent=self)
 
-        self.hitbox_label_label = wx.StaticText(parent=self, label="Label")
-        self.hitbox_label = wx.TextCtrl(parent=self, size=(180, -1))
+        self.hitbox_line = wx.StaticLine(parent=self.hitbox_panel)
 
-        self.hitbox_global_x_label = wx.StaticText(parent=self, label="Global x")
-        self.hitbox_global_x = wx.TextCtrl(parent=self, size=(180, -1))
+        self.hitbox_header = wx.StaticText(parent=self.hitbox_panel, label="Hitbox")
+        self.hitbox_header.SetFont(self.header_font)
 
-        self.hitbox_global_y_label = wx.StaticText(parent=self, label="Global y")
-        self.hitbox_global_y = wx.TextCtrl(parent=self, size=(180, -1))
+        self.hitbox_field_labels = [] # The labels of the hitbox properties
+        self.hitbox_ctrls = {} # Maps a hitbox property name to its control
 
-        self.hitbox_local_x_label = wx.StaticText(parent=self, label="Local x")
-        self.hitbox_local_x = wx.TextCtrl(parent=self, size=(180, -1))
+        for name, label in HITBOX_FIELDS:
+            self.hitbox_field_labels.append(
+                wx.StaticText(parent=self.hitbox_panel, label=label)
+            )
 
-        self.hitbox_local_y_label = wx.StaticText(parent=self, label="Local y")
-        self.hitbox_local_y = wx.TextCtrl(parent=self, size=(180, -1))
+            # Every hitbox property except the label is a whole number
+            if name == "label":
+                ctrl = wx.TextCtrl(parent=self.hitbox_panel, size=CTRL_SIZE)
 
-        self.hitbox_width_label = wx.StaticText(parent=self, label="Width")
-        self.hitbox_width = wx.TextCtrl(parent=self, size=(180, -1))
+            else:
+                ctrl = wx.SpinCtrl(
+                    parent=self.hitbox_panel,
+                    size=CTRL_SIZE,
+                    min=-100000,
+                    max=100000,
+                )
 
-        self.hitbox_height_label = wx.StaticText(parent=self, label="Height")
-        self.hitbox_height = wx.TextCtrl(parent=self, size=(180, -1))
+            self.hitbox_ctrls[name] = ctrl
 
-        self.transparency_label = wx.StaticText(parent=self, label="Transparency")
+        self.transparency_label = wx.StaticText(parent=self.hitbox_panel, label="Transparency")
         self.transparency = wx.Slider(
-            parent=self,
+            parent=self.hitbox_panel,
             value=127,
             minValue=0,
             maxValue=255,
-            size=(180, -1),
+            size=CTRL_SIZE,
             style=wx.SL_HORIZONTAL | wx.SL_MIN_MAX_LABELS,
         )
 
+        self.transparency_timer = None # Sends the transparency while dragging
+
+        self.Bind(wx.EVT_SLIDER, self.__on_slider, id=self.transparency.GetId())
+        self.Bind(
+            wx.EVT_SCROLL_THUMBRELEASE,
+            self.__on_slider_release,
+            id=self.transparency.GetId(),
+        )
+
     def __init_sprite_properties(self):
         """Initializes the sprite properties.
 
@@ -284,18 +306,18 @@ class Inspector(wx.Panel):
 
         """
 
-        self.sprite_line_label = wx.StaticLine(parent=self)
-        self.sprite_line_widget = wx.StaticLine(parent=self)
+        self.sprite_panel = wx.Panel(parent=self)
+
+        self.sprite_line = wx.StaticLine(parent=self.sprite_panel)
 
-        self.sprite_header = wx.StaticText(parent=self, label="Sprite")
-        self.sprite_header.SetFont(wx.Font(wx.FontInfo().Bold()))
-        self.sprite_header_blank = wx.StaticText(parent=self, label="")
+        self.sprite_header = wx.StaticText(parent=self.sprite_panel, label="Sprite")
+        self.sprite_header.SetFont(self.header_font)
 
-        self.sprite_label_label = wx.StaticText(parent=self, label="Label")
-        self.sprite_label = wx.TextCtrl(parent=self, size=(180, -1))
+        self.sprite_label_label = wx.StaticText(parent=self.sprite_panel, label="Label")
+        self.sprite_label = wx.TextCtrl(parent=self.sprite_panel, size=CTRL_SIZE)
 
-        self.isolate_hitboxes_label = wx.StaticText(parent=self, label="Isolate")
-        self.isolate_hitboxes = wx.CheckBox(parent=self, label="Enable")
+        self.isolate_hitboxes_label = wx.StaticText(parent=self.sprite_panel, label="Isolate")
+        self.isolate_hitboxes = wx.CheckBox(parent=self.sprite_panel, label="Enable")
 
     def __init_spritesheet_properties(self):
         """Initialized the spritesheet properties.
@@ -307,27 +329,29 @@ class Inspector(wx.Panel):
 
         """
 
-        self.spritesheet_line_label = wx.StaticLine(parent=self)
-        self.spritesheet_line_widget = wx.StaticLine(parent=self)
+        self.spritesheet_panel = wx.Panel(parent=self)
+
+        self.spritesheet_line = wx.StaticLine(parent=self.spritesheet_panel)
 
-        self.spritesheet_header = wx.StaticText(parent=self, label="Spritesheet")
-        self.spritesheet_header.SetFont(wx.Font(wx.FontInfo().Bold()))
-        self.spritesheet_header_blank = wx.StaticText(parent=self, label="")
+        self.spritesheet_header = wx.StaticText(parent=self.spritesheet_panel, label="Spritesheet")
+        self.spritesheet_header.SetFont(self.header_font)
 
-        self.spritesheet_rows_label = wx.StaticText(parent=self, label="Rows")
-        self.spritesheet_rows = wx.TextCtrl(
-            parent=self,
-            size=(180, -1),
-            value="1",
-            style=wx.TE_PROCESS_ENTER,
+        self.spritesheet_rows_label = wx.StaticText(parent=self.spritesheet_panel, label="Rows")
+        self.spritesheet_rows = wx.SpinCtrl(
+            parent=self.spritesheet_panel,
+            size=CTRL_SIZE,
+            min=1,
+            max=10000,
+            initial=1,
         )
 
-        self.spritesheet_cols_label = wx.StaticText(parent=self, label="Columns")
-        self.spritesheet_cols = wx.TextCtrl(
-            parent=self,
-            size=(180, -1),
-            value="1",
-            style=wx.TE_PROCESS_ENTER,
+        self.spritesheet_cols_label = wx.StaticText(parent=self.spritesheet_panel, label="Columns")
+        self.spritesheet_cols = wx.SpinCtrl(
+            parent=self.spritesheet_panel,
+            size=CTRL_SIZE,
+            min=1,
+            max=10000,
+            initial=1,
         )
 
     def __on_checkbox(self, event: wx.CommandEvent):
@@ -340,68 +364,124 @@ class Inspector(wx.Panel):
         """ 
         wx.PostEvent(self.Parent, ToggleIsolateEvent(isolate=self.isolate_hitboxes.IsChecked()))
 
+    def __on_destroy(self, event: wx.WindowDestroyEvent):
+        """Stops sending the transparency once the inspector is destroyed.
+
+        Parameters
+        ------------
+        event: wx.WindowDestroyEvent
+            generated when the inspector is being destroyed.
+        """
+        if self.transparency_timer is not None:
+            self.transparency_timer.Stop()
+
+        event.Skip()
+
     def __on_slider(self, event: wx.CommandEvent):
         """Changes the transparency of the hitboxes.
 
+        The slider generates an event for every step while it is dragged, so
+        the transparency is sent at most once every 50 milliseconds.
+
         Parameters
         ------------
         event: wx.CommandEvent
             generated after any change of the lider position.
         """
+        if self.transparency_timer is None or not self.transparency_timer.IsRunning():
+            self.transparency_timer = wx.CallLater(50, self.__post_transparency)
+
+    def __on_slider_release(self, event: wx.ScrollEvent):
+        """Sends the final transparency as soon as the slider is released.
+
+        Parameters
+        ------------
+        event: wx.ScrollEvent
+            generated when the slider thumb is released.
+        """
+        if self.transparency_timer is not None:
+            self.transparency_timer.Stop()
+
+        self.__post_transparency()
+
+        event.Skip()
+
+    def __post_transparency(self):
+        """Sends the transparency of the hitboxes to the parent."""
+        # The inspector may have been destroyed while waiting
+        if not self:
+            return
+
         wx.PostEvent(self.Parent, UpdateTransparencyEvent(alpha=self.transparency.GetValue()))
 
     def __size_components(self):
-        """Places all the initialized items in the inspector panel."""
+        """Places all the initialized items in the inspector panel.
 
-        sizer = wx.FlexGridSizer(cols=2, vgap=10, hgap=5)
+        Each group of properties is laid out in its own panel, so that the
+        group can be enabled or disabled as a whole.
+        """
+        self.__align_labels()
 
         ##########################
         # Spritesheet Properties #
         ##########################
-        sizer.Add(window=self.spritesheet_line_label, flag=ALL_EXPAND)
-        sizer.Add(window=self.spritesheet_line_widget, flag=ALL_EXPAND)
-        sizer.Add(window=self.spritesheet_header, flag=ALL_EXPAND)
-        sizer.Add(window=self.spritesheet_header_blank, flag=ALL_EXPAND)
-        sizer.Add(window=self.spritesheet_rows_label, flag=CENTER_RIGHT)
-        sizer.Add(window=self.spritesheet_rows, flag=ALL_EXPAND)
-        sizer.Add(window=self.spritesheet_cols_label, flag=CENTER_RIGHT)
-        sizer.Add(window=self.spritesheet_cols, flag=ALL_EXPAND)
+        spritesheet_items = (
+            (self.spritesheet_rows_label, CENTER_RIGHT),
+            (self.spritesheet_rows, ALL_EXPAND),
+            (self.spritesheet_cols_label, CENTER_RIGHT),
+            (self.spritesheet_cols, ALL_EXPAND),
+        )
+
+        spritesheet_sizer = self.__create_group_sizer(
+            line=self.spritesheet_line,
+            header=self.spritesheet_header,
+            items=spritesheet_items,
+        )
+
+        self.spritesheet_panel.SetSizer(spritesheet_sizer)
 
         #####################
         # Sprite Properties #
         #####################
-        sizer.Add(window=self.sprite_line_label, flag=ALL_EXPAND)
-        sizer.Add(window=self.sprite_line_widget, flag=ALL_EXPAND)
-        sizer.Add(window=self.sprite_header, flag=ALL_EXPAND)
-        sizer.Add(window=self.sprite_header_blank, flag=ALL_EXPAND)
-        sizer.Add(window=self.sprite_label_label, flag=CENTER_RIGHT)
-        sizer.Add(window=self.sprite_label, flag=ALL_EXPAND)
-        sizer.Add(window=self.isolate_hitboxes_label, flag=CENTER_RIGHT)
-        sizer.Add(window=self.isolate_hitboxes, flag=wx.ALIGN_RIGHT)
+        sprite_items = (
+            (self.sprite_label_label, CENTER_RIGHT),
+            (self.sprite_label, ALL_EXPAND),
+            (self.isolate_hitboxes_label, CENTER_RIGHT),
+            (self.isolate_hitboxes, wx.ALIGN_RIGHT),
+        )
+
+        sprite_sizer = self.__create_group_sizer(
+            line=self.sprite_line,
+            header=self.sprite_header,
+            items=sprite_items,
+        )
+
+        self.sprite_panel.SetSizer(sprite_sizer)
 
         #####################
         # Hitbox Properties #
         #####################
-        sizer.Add(window=self.hitbox_line_label, flag=ALL_EXPAND)
-        sizer.Add(window=self.hitbox_line_widget, flag=ALL_EXPAND)
-        sizer.Add(window=self.hitbox_header, flag=ALL_EXPAND)
-        sizer.Add(window=self.hitbox_header_blank, flag=ALL_EXPAND)
-        sizer.Add(window=self.hitbox_label_label, flag=CENTER_RIGHT)
-        sizer.Add(window=self.hitbox_label, flag=ALL_EXPAND)
-        sizer.Add(window=self.hitbox_global_x_label, flag=CENTER_RIGHT)
-        sizer.Add(window=self.hitbox_global_x, flag=ALL_EXPAND)
-        sizer.Add(window=self.hitbox_global_y_label, flag=CENTER_RIGHT)
-        sizer.Add(window=self.hitbox_global_y, flag=ALL_EXPAND)
-        sizer.Add(window=self.hitbox_local_x_label, flag=CENTER_RIGHT)
-        sizer.Add(window=self.hitbox_local_x, flag=ALL_EXPAND)
-        sizer.Add(window=self.hitbox_local_y_label, flag=CENTER_RIGHT)
-        sizer.Add(window=self.hitbox_local_y, flag=ALL_EXPAND)
-        sizer.Add(window=self.hitbox_width_label, flag=CENTER_RIGHT)
-        sizer.Add(window=self.hitbox_width, flag=ALL_EXPAND)
-        sizer.Add(window=self.hitbox_height_label, flag=CENTER_RIGHT)
-        sizer.Add(window=self.hitbox_height, flag=ALL_EXPAND)
-        sizer.Add(window=self.transparency_label, flag=CENTER_RIGHT)
-        sizer.Add(window=self.transparency, flag=ALL_EXPAND)
+        hitbox_items = []
+
+        for label, ctrl in zip(self.hitbox_field_labels, self.hitbox_ctrls.values()):
+            hitbox_items.append((label, CENTER_RIGHT))
+            hitbox_items.append((ctrl, ALL_EXPAND))
+
+        hitbox_items.append((self.transparency_label, CENTER_RIGHT))
+        hitbox_items.append((self.transparency, ALL_EXPAND))
+
+        hitbox_sizer = self.__create_group_sizer(
+            line=self.hitbox_line,
+            header=self.hitbox_header,
+            items=hitbox_items,
+        )
+
+        self.hitbox_panel.SetSizer(hitbox_sizer)
+
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.Add(window=self.spritesheet_panel, flag=wx.EXPAND | wx.BOTTOM, border=10)
+        sizer.Add(window=self.sprite_panel, flag=wx.EXPAND | wx.BOTTOM, border=10)
+        sizer.Add(window=self.hitbox_panel, flag=wx.EXPAND)
 
         self.SetSizer(sizer)
         self.Layout()
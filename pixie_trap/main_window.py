@@ -35,6 +35,8 @@ class MainWindow(wx.Frame):
     - a canvas
     """
 
+    tool_bitmaps = {} # Maps toolbar icon file names to bitmaps
+
     def __init__(self):
         super().__init__(
             parent=None,
@@ -43,6 +45,9 @@ class MainWindow(wx.Frame):
             style=wx.DEFAULT_FRAME_STYLE | wx.CLIP_CHILDREN,
         )
 
+        # Lay out the whole window before it is painted
+        self.Freeze()
+
         # wxpython settings
         self.SetDoubleBuffered(True)
         self.Maximize()
@@ -52,15 +57,26 @@ class MainWindow(wx.Frame):
         # Internal parameters
         self.saved = True
         self.savefile = None
+        self.dialog_dir = os.getcwd() # The last directory chosen in a file dialog
 
         # Components
         self.canvas = Canvas(parent=self)
         self.inspector = Inspector(parent=self)
 
+        # Dialogs reused every time they are shown
+        self.continue_dialog = wx.MessageDialog(
+            parent=self,
+            message="Current work has not been saved. Continue?",
+            caption="Current work not saved",
+            style=wx.ICON_QUESTION | wx.YES_NO,
+        )
+
         self.__size_components()
         self.__init_menubar()
         self.__init_toolbar()
 
+        self.Thaw()
+
         self.Bind(wx.EVT_MENU, self.__on_menubar_file_close, id=self.menubar_file_close.GetId())
         self.Bind(wx.EVT_MENU, self.__on_menubar_file_export_as, id=self.menubar_file_export_as.GetId())
         self.Bind(wx.EVT_MENU, self.__on_menubar_file_new, id=self.menubar_file_new.GetId())
@@ -74,12 +90,12 @@ class MainWindow(wx.Frame):
         self.Bind(wx.EVT_TOOL, self.__on_tool_select, id=self.tool_select.GetId())
 
         self.Bind(
-            wx.EVT_TEXT,
+            wx.EVT_SPINCTRL,
             self.__on_spritesheet_properties,
             id=self.inspector.spritesheet_rows.GetId(),
         )
         self.Bind(
-            wx.EVT_TEXT,
+            wx.EVT_SPINCTRL,
             self.__on_spritesheet_properties,
             id=self.inspector.spritesheet_cols.GetId(),
         )
@@ -108,14 +124,7 @@ class MainWindow(wx.Frame):
         """
 
         if not self.saved:
-            confirm_continue = wx.MessageBox(
-                parent=self,
-                message="Current work has not been saved. Continue?",
-                caption="Current work not saved",
-                style=wx.ICON_QUESTION | wx.YES_NO,
-            )
-
-            if confirm_continue == wx.NO:
+            if self.continue_dialog.ShowModal() == wx.ID_NO:
                 return False
         
         return True
@@ -139,6 +148,9 @@ class MainWindow(wx.Frame):
     def __init_menubar_file(self):
         """Initializes the file menu in the menubar.
 
+        The items use the standard IDs where wx has one, so the platform can
+        treat them as the usual file menu items.
+
         The menu consists of the following items::
 
         - New...
@@ -155,31 +167,31 @@ class MainWindow(wx.Frame):
 
         self.menubar_file_new = wx.MenuItem(
             parentMenu=self.menubar_file,
-            id=wx.ID_ANY,
+            id=wx.ID_NEW,
             text="New...\tCTRL+N",
             kind=wx.ITEM_NORMAL,
         )
         self.menubar_file_open = wx.MenuItem(
             parentMenu=self.menubar_file,
-            id=wx.ID_ANY,
+            id=wx.ID_OPEN,
             text="Open...\tCTRL+O",
             kind=wx.ITEM_NORMAL,
         )
         self.menubar_file_close = wx.MenuItem(
             parentMenu=self.menubar_file,
-            id=wx.ID_ANY,
+            id=wx.ID_CLOSE,
             text="Close\tCTRL+W",
             kind=wx.ITEM_NORMAL,
         )
         self.menubar_file_save = wx.MenuItem(
             parentMenu=self.menubar_file,
-            id=wx.ID_ANY,
+            id=wx.ID_SAVE,
             text="Save\tCTRL+S",
             kind=wx.ITEM_NORMAL,
         )
         self.menubar_file_save_as = wx.MenuItem(
             parentMenu=self.menubar_file,
-            id=wx.ID_ANY,
+            id=wx.ID_SAVEAS,
             text="Save As...\tCTRL+SHIFT+S",
             kind=wx.ITEM_NORMAL,
         )
@@ -191,7 +203,7 @@ class MainWindow(wx.Frame):
         )
         self.menubar_file_quit = wx.MenuItem(
             parentMenu=self.menubar_file,
-            id=wx.ID_ANY,
+            id=wx.ID_EXIT,
             text="Quit\tCTRL+Q",
             kind=wx.ITEM_NORMAL,
         )
@@ -230,7 +242,7 @@ class MainWindow(wx.Frame):
         self.tool_select = self.tool_bar.AddTool(
             toolId=wx.ID_ANY,
             label="Select",
-            bitmap=wx.Bitmap(name=os.path.join(BASE_DIR, "assets/tool_select.png")),
+            bitmap=self.__load_tool_bitmap("tool_select.png"),
             kind=wx.ITEM_CHECK,
         )
 
@@ -239,7 +251,7 @@ class MainWindow(wx.Frame):
         self.tool_move = self.tool_bar.AddTool(
             toolId=wx.ID_ANY,
             label="Move",
-            bitmap=wx.Bitmap(name=os.path.join(BASE_DIR, "assets/tool_move.png")),
+            bitmap=self.__load_tool_bitmap("tool_move.png"),
             kind=wx.ITEM_CHECK,
         )
 
@@ -248,7 +260,7 @@ class MainWindow(wx.Frame):
         self.tool_draw = self.tool_bar.AddTool(
             toolId=wx.ID_ANY,
             label="Draw",
-            bitmap=wx.Bitmap(name=os.path.join(BASE_DIR, "assets/tool_draw.png")),
+            bitmap=self.__load_tool_bitmap("tool_draw.png"),
             kind=wx.ITEM_CHECK,
         )
 
@@ -257,14 +269,40 @@ class MainWindow(wx.Frame):
         self.tool_colour_picker = self.tool_bar.AddTool(
             toolId=wx.ID_ANY,
             label="Colour Picker",
-            bitmap=wx.Bitmap(
-                name=os.path.join(BASE_DIR, "assets/tool_colour_picker.png")
-            ),
+            bitmap=self.__load_tool_bitmap("tool_colour_picker.png"),
             kind=wx.ITEM_NORMAL,
         )
 
         self.tool_bar.Realize()
 
+    def __load_tool_bitmap(self, filename: str):
+        """Loads a toolbar icon from the `assets` directory.
+
+        The icons are known to be PNG files, so the type is given explicitly
+        instead of being detected from the file. Each icon is only loaded
+        once and is shared by every main window.
+
+        Parameters
+        ------------
+        filename: str
+            the name of the icon file.
+
+        Returns
+        ---------
+        wx.Bitmap
+            the toolbar icon.
+        """
+        bitmap = MainWindow.tool_bitmaps.get(filename)
+
+        if bitmap is None:
+            bitmap = wx.Bitmap(
+                name=os.path.join(BASE_DIR, "assets", filename),
+                type=wx.BITMAP_TYPE_PNG,
+            )
+            MainWindow.tool_bitmaps[filename] = bitmap
+
+        return bitmap
+
     def __on_menubar_file_close(self, event: wx.MenuEvent):
         """Resets the current canvas.
 
@@ -273,8 +311,9 @@ class MainWindow(wx.Frame):
         event: wx.MenuEvent
             contains information about the menu event.
         """ 
-        if not self.saved:
-            self.__on_menubar_file_save(event)
+        # Keep the current work if it could not be saved
+        if not self.saved and not self.__on_menubar_file_save(event):
+            return
 
         self.reset()
 
@@ -291,6 +330,7 @@ class MainWindow(wx.Frame):
         with wx.FileDialog(
             parent=self,
             message="Export current canvas to JSON",
+            defaultDir=self.dialog_dir,
             wildcard=JSON_WILDCARD,
             style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT,
         ) as dialog:
@@ -299,8 +339,13 @@ class MainWindow(wx.Frame):
 
             exportfile = dialog.GetPath()
 
+        self.dialog_dir = os.path.dirname(exportfile)
+
+        # Encode the whole document first so it is written in one call
+        data = json.dumps(self.canvas.to_json(), indent=4)
+
         with open(exportfile, "w") as file:
-            json.dump(self.canvas.to_json(), file, indent=4)
+            file.write(data)
 
     def __on_menubar_file_new(self, event: wx.MenuEvent):
         """Resets the canvas and loads a new spritesheet.
@@ -316,7 +361,7 @@ class MainWindow(wx.Frame):
         with wx.FileDialog(
             parent=self,
             message="Select a spritesheet",
-            defaultDir=os.getcwd(),
+            defaultDir=self.dialog_dir,
             defaultFile="",
             wildcard=IMAGE_WILDCARD,
             style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST,
@@ -326,6 +371,8 @@ class MainWindow(wx.Frame):
 
             filepath = dialog.GetPath()
 
+        self.dialog_dir = os.path.dirname(filepath)
+
         self.canvas.reset()
         self.canvas.load_spritesheet(filepath)
 
@@ -385,8 +432,9 @@ class MainWindow(wx.Frame):
         event: wx.MenuEvent
             contains information about the menu event.
         """
-        if not self.saved:
-            self.__on_menubar_file_save(event)
+        # Keep the current work if it could not be saved
+        if not self.saved and not self.__on_menubar_file_save(event):
+            return
 
         self.Close()
 
@@ -398,12 +446,19 @@ class MainWindow(wx.Frame):
         ------------
         event: wx.MenuEvent
             contains information about the menu event.
+
+        Returns
+        ---------
+        saved: bool
+            `True` if the canvas was saved, `False` otherwise.
         """
         if self.savefile is None:
             self.__set_savefile()
 
-        if self.savefile is not None:
-            self.__save()
+        if self.savefile is None:
+            return False
+
+        return self.__save()
 
     def __on_menubar_file_save_as(self, event: wx.MenuEvent):
         """Saves the current canvas to the current savefile. Always asks to
@@ -439,8 +494,8 @@ class MainWindow(wx.Frame):
             contains information about command events from controls.
         """
         self.canvas.set_rulers(
-            rows=int(self.inspector.spritesheet_rows.GetValue()),
-            cols=int(self.inspector.spritesheet_cols.GetValue()),
+            rows=self.inspector.spritesheet_rows.GetValue(),
+            cols=self.inspector.spritesheet_cols.GetValue(),
         )
 
         self.saved = False
@@ -531,13 +586,15 @@ class MainWindow(wx.Frame):
             custom event with properties `label`, `global_x`, `global_y`,
             `local_x`, `local_y`, `width`, `height`.
         """
-        self.inspector.hitbox_label.SetValue(event.label)
-        self.inspector.hitbox_global_x.SetValue(str(event.global_x))
-        self.inspector.hitbox_global_y.SetValue(str(event.global_y))
-        self.inspector.hitbox_local_x.SetValue(str(event.local_x))
-        self.inspector.hitbox_local_y.SetValue(str(event.local_y))
-        self.inspector.hitbox_width.SetValue(str(event.width))
-        self.inspector.hitbox_height.SetValue(str(event.height))
+        self.inspector.set_hitbox_properties(
+            label=event.label,
+            global_x=event.global_x,
+            global_y=event.global_y,
+            local_x=event.local_x,
+            local_y=event.local_y,
+            width=event.width,
+            height=event.height,
+        )
 
     def __on_update_transparency(self, event: UpdateTransparencyEvent):
         """Updates the transparency of the hitboxes.
@@ -563,8 +620,20 @@ class MainWindow(wx.Frame):
         - Compress the temporary directory into a PXT file
         - Remove the temporary directory
 
+        Nothing is saved while the spritesheet is still being loaded, since
+        the canvas does not have the new spritesheet yet.
+
+        Returns
+        ---------
+        saved: bool
+            `True` if the canvas was saved, `False` otherwise.
         """
 
+        if self.canvas.spritesheet_pending is not None:
+            wx.LogError("The spritesheet is still loading, so nothing was saved")
+
+            return False
+
         temp_dir = "temp_" + self.savefile
         spritesheet_file = os.path.join(temp_dir, "spritesheet.bmp")
         data_file = os.path.join(temp_dir, "data.json")
@@ -576,8 +645,10 @@ class MainWindow(wx.Frame):
         self.canvas.spritesheet.SaveFile(name=spritesheet_file, type=wx.BITMAP_TYPE_BMP)
 
         # Save the JSON data
+        data = json.dumps(self.canvas.to_dict(), indent=4, sort_keys=True)
+
         with open(data_file, "w") as file:
-            json.dump(self.canvas.to_dict(), file, index=4, sort_keys=True)
+            file.write(data)
 
         # Compress the temporary directory
         archive_file = shutil.make_archive(
@@ -594,12 +665,15 @@ class MainWindow(wx.Frame):
 
         self.saved = True
 
+        return True
+
     def __set_savefile(self):
         """Prompts the user to specify a save file."""
 
         with wx.FileDialog(
             parent=self,
             message="Save current canvas",
+            defaultDir=self.dialog_dir,
             wildcard=PXT_WILDCARD,
             style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT,
         ) as dialog:
@@ -608,6 +682,8 @@ class MainWindow(wx.Frame):
 
             self.savefile = dialog.GetPath()
 
+        self.dialog_dir = os.path.dirname(self.savefile)
+
         if os.path.splitext(self.savefile)[0] == self.savefile:
             self.savefile += ".pxt"
 
@@ -14,6 +14,8 @@ class Point:
         The y-coordinate.
     """
 
+    __slots__ = ("x", "y")
+
     def __init__(self, x: int = 0, y: int = 0):
         self.set(x=x, y=y)
 
@@ -64,6 +66,8 @@ class Rect:
         The name of the rectangle.
     """
 
+    __slots__ = ("x", "y", "w", "h")
+
     def __init__(self, x: int = 0, y: int = 0, w: int = 0, h: int = 0):
         self.set(x=x, y=y, w=w, h=h)
 
@@ -335,7 +339,7 @@ class ScaleRects:
         self.rects.append(top_left)
         self.rects.append(top_right)
         self.rects.append(bottom_left)
-        self.rects.append(bottom_left)
+        self.rects.append(bottom_right)
 
         self.keys = {
             Scale.TOP: 0,
@@ -348,8 +352,14 @@ class ScaleRects:
             Scale.BOTTOM_RIGHT: 7,
         }
 
+        # Maps an index back to its `Scale`
+        self.scales = tuple(sorted(self.keys, key=self.keys.get))
+
+        self.rect_key = None # The rectangle the scaling pins were set on
+
     def move(self, dx: int = 0, dy: int = 0):
         self.rects.move(dx=dx, dy=dy)
+        self.rect_key = None
 
     def select_scale(self, point: Point):
         """Selects a scale operation based on which scaling pin contains the
@@ -366,11 +376,17 @@ class ScaleRects:
             A :class:`Scale` direction if the given point is inside one of the
             scaling pins, `None` otherwise.
         """
-        for scale, index in self.keys.items():
-            if self.rects.get(index).contains(point):
-                return scale
+        rects = self.rects
+
+        # Test all of the scaling pins at once
+        x_in = (rects.x <= point.x) & (point.x <= rects.x + rects.w)
+        y_in = (rects.y <= point.y) & (point.y <= rects.y + rects.h)
+        hits = np.flatnonzero(x_in & y_in)
 
-        return None
+        if hits.size == 0:
+            return None
+
+        return self.scales[hits[0]]
 
     def set(self, rect: Rect, radius: int = 10):
         """Sets the scaling pins based on the given rectangle.
@@ -383,87 +399,27 @@ class ScaleRects:
             Half of the width and height of the scaling pins. This affects the
             size of the scaling pins.
         """
-        diametre = 2 * radius
-
-        self.rects.set(
-            index=0,
-            rect=Rect(
-                x=rect.centre.x - radius,
-                y=rect.y - radius,
-                w=diametre,
-                h=diametre,
-            ),
-        )
-
-        self.rects.set(
-            index=1,
-            rect=Rect(
-                x=rect.x - radius,
-                y=rect.centre.y - radius,
-                w=diametre,
-                h=diametre,
-            ),
-        )
-
-        self.rects.set(
-            index=2,
-            rect=Rect(
-                x=rect.x + rect.w - radius,
-                y=rect.centre.y - radius,
-                w=diametre,
-                h=diametre,
-            ),
-        )
-
-        self.rects.set(
-            index=3,
-            rect=Rect(
-                x=rect.centre.x - radius,
-                y=rect.y + rect.h - radius,
-                w=diametre,
-                h=diametre,
-            ),
-        )
-
-        self.rects.set(
-            index=4,
-            rect=Rect(
-                x=rect.x - radius,
-                y=rect.y - radius,
-                w=diametre,
-                h=diametre,
-            ),
-        )
-
-        self.rects.set(
-            index=5,
-            rect=Rect(
-                x=rect.x + rect.w - radius,
-                y=rect.y - radius,
-                w=diametre,
-                h=diametre,
-            ),
-        )
-
-        self.rects.set(
-            index=6,
-            rect=Rect(
-                x=rect.x - radius,
-                y=rect.y + rect.h - radius,
-                w=diametre,
-                h=diametre,
-            ),
-        )
-
-        self.rects.set(
-            index=7,
-            rect=Rect(
-                x=rect.x + rect.w - radius,
-                y=rect.y + rect.h - radius,
-                w=diametre,
-                h=diametre,
-            ),
-        )
+        key = (rect.x, rect.y, rect.w, rect.h, radius)
+
+        # The scaling pins are already set on this rectangle
+        if key == self.rect_key:
+            return
+
+        centre = rect.centre
+        left = rect.x - radius
+        middle_x = centre.x - radius
+        right = rect.x + rect.w - radius
+        top = rect.y - radius
+        middle_y = centre.y - radius
+        bottom = rect.y + rect.h - radius
+
+        # Set all of the scaling pins at once in the order of `self.keys`
+        self.rects.x = [middle_x, left, right, middle_x, left, right, left, right]
+        self.rects.y = [top, middle_y, middle_y, bottom, top, top, bottom, bottom]
+        self.rects.w = 2 * radius
+        self.rects.h = 2 * radius
+
+        self.rect_key = key
 
     @property
     def top(self):
@@ -474,7 +430,7 @@ class ScaleRects:
         Rect
             The scaling pin along the top border.
         """
-        return self.rects[Scale.TOP]
+        return self.rects[self.keys[Scale.TOP]]
 
     @property
     def left(self):
@@ -485,7 +441,7 @@ class ScaleRects:
         Rect
             The scaling pin along the left border.
         """
-        return self.rects[Scale.LEFT]
+        return self.rects[self.keys[Scale.LEFT]]
 
     @property
     def right(self):
@@ -496,7 +452,7 @@ class ScaleRects:
         Rect
             The scaling pin along the right border.
         """
-        return self.rects[Scale.RIGHT]
+        return self.rects[self.keys[Scale.RIGHT]]
 
     @property
     def bottom(self):
@@ -507,7 +463,7 @@ class ScaleRects:
         Rect
             The scaling pin along the bottom border.
         """
-        return self.rects[Scale.BOTTOM]
+        return self.rects[self.keys[Scale.BOTTOM]]
 
     @property
     def top_left(self):
@@ -518,7 +474,7 @@ class ScaleRects:
         Rect
             The scaling pin at the top left corner.
         """
-        return self.rects[Scale.TOP_LEFT]
+        return self.rects[self.keys[Scale.TOP_LEFT]]
 
     @property
     def top_right(self):
@@ -529,7 +485,7 @@ class ScaleRects:
         Rect
             The scaling pin at the top right corner.
         """
-        return self.rects[Scale.TOP_RIGHT]
+        return self.rects[self.keys[Scale.TOP_RIGHT]]
 
     @property
     def bottom_left(self):
@@ -540,7 +496,7 @@ class ScaleRects:
         Rect
             The scaling pin at the bottom left corner.
         """
-        return self.rects[Scale.BOTTOM_LEFT]
+        return self.rects[self.keys[Scale.BOTTOM_LEFT]]
 
     @property
     def bottom_right(self):
@@ -551,4 +507,4 @@ class ScaleRects:
         Rect
             The scaling pin at the bottom right corner.
         """
-        return self.rects[Scale.BOTTOM_RIGHT]
+        return self.rects[self.keys[Scale.BOTTOM_RIGHT]]